@@ -1,46 +1,132 @@
 #!/usr/bin/env python3
-import subprocess
-import pathlib
 import datetime
-import click
-import mako.template
+import functools
+import hashlib
+import json
+import os
+import pathlib
+import subprocess
+import sys
+import typing
+
+if typing.TYPE_CHECKING:
+    import mako.template
+
+OUTPUT_PATH = pathlib.Path("docs") / "index.html"
+BUILD_HASH_PATH = pathlib.Path(".build-hash")
+
+
+def colored(text: str, color_code: int) -> str:
+    if not sys.stdout.isatty():
+        return text
+    return f"\033[{color_code}m{text}\033[0m"
+
+
+def green(text: str) -> str:
+    return colored(text, 32)
+
+
+def yellow(text: str) -> str:
+    return colored(text, 33)
+
+
+def red(text: str) -> str:
+    return colored(text, 31)
 
 
 def read_text_file(filepath: pathlib.Path) -> str:
-    with open(filepath, "r", encoding="utf-8") as f:
-        return f.read().strip()
+    return filepath.read_text(encoding="utf-8").strip()
 
 
-def load_staff_member(member_dir: pathlib.Path) -> dict:
-    return {
-        "name": read_text_file(member_dir / "name.txt"),
-        "title": read_text_file(member_dir / "title.txt"),
-        "image": read_text_file(member_dir / "image.txt"),
-        "bio": read_text_file(member_dir / "bio.txt"),
-    }
+def latest_mtime(directory: pathlib.Path) -> float:
+    return max(p.stat().st_mtime for p in [directory, *directory.rglob("*")])
+
+
+def source_digest(templates_dir: pathlib.Path) -> str:
+    generator_path = pathlib.Path(__file__)
+    sources = {p.as_posix(): p for p in templates_dir.rglob("*") if p.is_file()}
+    sources[generator_path.name] = generator_path
+    digest = hashlib.blake2b()
+    for name in sorted(sources):
+        content = sources[name].read_bytes()
+        digest.update(f"{name}\0{len(content)}\0".encode())
+        digest.update(content)
+    return digest.hexdigest()
+
+
+def is_up_to_date(digest: str) -> bool:
+    try:
+        built_digest = BUILD_HASH_PATH.read_text(encoding="utf-8").strip()
+    except FileNotFoundError:
+        return False
+    return built_digest == digest and OUTPUT_PATH.exists()
+
 
+def load_staff_member(templates_dir: pathlib.Path, member_id: str) -> dict:
+    try:
+        return json.loads((templates_dir / f"{member_id}.json").read_bytes())
+    except FileNotFoundError:
+        member_path = templates_dir / member_id
+        return {
+            "name": read_text_file(member_path / "name.txt"),
+            "title": read_text_file(member_path / "title.txt"),
+            "image": read_text_file(member_path / "image.txt"),
+            "bio": read_text_file(member_path / "bio.txt"),
+        }
 
-def run_precommit() -> bool:
+
+def changed_files() -> list[str]:
     result = subprocess.run(
-        ["pre-commit", "run", "--all-files"],
+        ["git", "diff", "--name-only", "-z", "--cached", "--diff-filter=d"],
         capture_output=True,
         text=True,
     )
-    return result.returncode == 0
-
+    files = [name for name in result.stdout.split("\0") if name]
+    if OUTPUT_PATH.as_posix() not in files:
+        files.append(OUTPUT_PATH.as_posix())
+    return files
 
-def load_staff_members(templates_dir: pathlib.Path) -> list[dict]:
-    staff_members = []
-    member_dirs = sorted([d for d in templates_dir.iterdir() if d.is_dir()])
-
-    for member_dir in member_dirs:
-        staff_members.append(load_staff_member(member_dir))
 
-    return staff_members
+def run_precommit(files: list[str]) -> bool:
+    result = subprocess.run(
+        ["pre-commit", "run", "--files", *files],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    return result.returncode == 0
 
 
-def prepare_template_context(welcome_text: str, staff_members: list[dict]) -> dict:
-    generation_timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+def load_staff_members(templates_dir: pathlib.Path) -> list[dict]:
+    with os.scandir(templates_dir) as entries:
+        member_ids = {
+            entry.name.removesuffix(".json")
+            for entry in entries
+            if entry.is_dir() or entry.name.endswith(".json")
+        }
+    return [load_staff_member(templates_dir, member_id) for member_id in sorted(member_ids)]
+
+
+def source_timestamp(templates_dir: pathlib.Path) -> str:
+    try:
+        log = subprocess.run(
+            ["git", "log", "-1", "--format=%cI", "--", templates_dir.as_posix()],
+            capture_output=True,
+            text=True,
+        )
+        commit_date = log.stdout.strip()
+    except FileNotFoundError:
+        commit_date = ""
+    if commit_date:
+        source_time = datetime.datetime.fromisoformat(commit_date)
+    else:
+        source_mtime = latest_mtime(templates_dir)
+        source_time = datetime.datetime.fromtimestamp(source_mtime, datetime.timezone.utc)
+    return source_time.astimezone(datetime.timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def prepare_template_context(
+    generation_timestamp: str, welcome_text: str, staff_members: list[dict]
+) -> dict:
     return {
         "welcome_text": welcome_text,
         "staff_members": staff_members,
@@ -48,49 +134,80 @@ def prepare_template_context(welcome_text: str, staff_members: list[dict]) -> di
     }
 
 
-def render_template(templates_dir: pathlib.Path, context: dict) -> str:
+@functools.cache
+def load_template(templates_dir: pathlib.Path) -> "mako.template.Template":
+    import mako.template
+
     template_path = templates_dir / "index.html.mako"
-    template = mako.template.Template(filename=str(template_path), input_encoding="utf-8")
-    return template.render(**context)
+    return mako.template.Template(
+        filename=str(template_path),
+        input_encoding="utf-8",
+    )
 
 
-def write_output(output: str) -> pathlib.Path:
-    output_path = pathlib.Path("docs") / "index.html"
+def render_template(templates_dir: pathlib.Path, context: dict, output: typing.TextIO):
+    import mako.runtime
 
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write(output)
+    template = load_template(templates_dir)
+    template.render_context(mako.runtime.Context(output, **context))
 
-    return output_path
 
+def write_output(templates_dir: pathlib.Path, context: dict) -> pathlib.Path:
+    temporary_path = OUTPUT_PATH.with_suffix(".html.tmp")
+    try:
+        with open(temporary_path, "w", encoding="utf-8", newline="", buffering=64 * 1024) as f:
+            render_template(templates_dir, context, f)
+        os.replace(temporary_path, OUTPUT_PATH)
+    except BaseException:
+        temporary_path.unlink(missing_ok=True)
+        raise
 
-def run_precommit_with_retries(max_attempts: int = 3):
-    click.echo("\nRunning pre-commit hooks...")
+    return OUTPUT_PATH
+
+
+def run_precommit_with_retries(
+    templates_dir: pathlib.Path, digest: str, max_attempts: int = 3
+):
+    print("\nRunning pre-commit hooks...")
     for attempt in range(1, max_attempts + 1):
-        click.echo(f"  Attempt {attempt}/{max_attempts}...")
-        if run_precommit():
-            click.secho("✓ Pre-commit hooks passed", fg="green")
+        print(f"  Attempt {attempt}/{max_attempts}...")
+        if run_precommit(changed_files()):
+            print(green("✓ Pre-commit hooks passed"))
             break
         elif attempt < max_attempts:
-            click.secho(f"  ⚠ Pre-commit modified files, retrying...", fg="yellow")
+            print(yellow(f"  ⚠ Pre-commit modified files, retrying..."))
+            current_digest = source_digest(templates_dir)
+            if current_digest != digest:
+                digest = current_digest
+                load_template.cache_clear()
+                generate(templates_dir, digest)
         else:
-            click.secho("✗ Pre-commit hooks failed after 3 attempts", fg="red")
-            raise click.Abort()
-
+            print(red("✗ Pre-commit hooks failed after 3 attempts"))
+            sys.exit(1)
 
-@click.command()
-def main():
-    templates_dir = pathlib.Path("templates")
 
+def generate(templates_dir: pathlib.Path, digest: str):
     welcome_text = read_text_file(templates_dir / "welcome.txt")
     staff_members = load_staff_members(templates_dir)
-    context = prepare_template_context(welcome_text, staff_members)
-    output = render_template(templates_dir, context)
-    output_path = write_output(output)
+    generation_timestamp = source_timestamp(templates_dir)
+    context = prepare_template_context(generation_timestamp, welcome_text, staff_members)
+    output_path = write_output(templates_dir, context)
+    BUILD_HASH_PATH.write_text(f"{digest}\n", encoding="utf-8")
+
+    print(green(f"✓ Generated {output_path}"))
+    print(green(f"  - Loaded {len(staff_members)} staff members"))
+
+
+def main():
+    templates_dir = pathlib.Path("templates")
 
-    click.secho(f"✓ Generated {output_path}", fg="green")
-    click.secho(f"  - Loaded {len(staff_members)} staff members", fg="green")
+    digest = source_digest(templates_dir)
+    if is_up_to_date(digest):
+        print(green(f"✓ {OUTPUT_PATH} is up to date"))
+    else:
+        generate(templates_dir, digest)
 
-    run_precommit_with_retries()
+    run_precommit_with_retries(templates_dir, digest)
 
 
 if __name__ == "__main__":